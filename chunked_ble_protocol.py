@@ -5,13 +5,36 @@ Enhanced with CRC32 validation, security limits, and timeouts
 """
 
 import asyncio
+import logging
 import struct
 import time
 import zlib  # For CRC32 calculation
-from typing import Callable, Optional, List
+from typing import Callable, Optional
 from bleak import BleakClient
 from bleak.backends.characteristic import BleakGATTCharacteristic
 
+# Optional CRC32 backends with PCLMULQDQ folding (same IEEE polynomial as zlib and ESP32)
+try:
+    from isal.isal_zlib import crc32 as _crc32  # Intel ISA-L
+    CRC32_BACKEND = "isal"
+except ImportError:
+    try:
+        from zlib_ng.zlib_ng import crc32 as _crc32  # zlib-ng
+        CRC32_BACKEND = "zlib-ng"
+    except ImportError:
+        try:
+            from deflate import crc32 as _crc32  # libdeflate
+            CRC32_BACKEND = "libdeflate"
+        except ImportError:
+            _crc32 = zlib.crc32
+            CRC32_BACKEND = "zlib"
+
+logger = logging.getLogger(__name__)
+
+# Precompiled 13-byte chunk header (little-endian, packed like ESP32 ChunkHeader):
+# chunk_num(2) + total_chunks(2) + data_size(1) + chunk_crc32(4) + global_crc32(4)
+_HDR = struct.Struct('<HHBII')
+
 # Default configuration - matching ESP32 UUIDs
 DEFAULT_SERVICE_UUID = "5b18eb9b-747f-47da-b7b0-a4e503f9a00f"
 DEFAULT_CHAR_UUID = "8f8b49a2-9117-4e9f-acfc-fda4d0db7408"
@@ -39,6 +62,7 @@ class ChunkedBLEProtocol:
     
     # Enhanced protocol constants
     CHUNK_SIZE = 172       # Data size per chunk (185 - 13 bytes header)
+    MAX_CHUNK_SIZE = 231   # Largest chunk data size the ESP32 accepts (247 - 3 - 13 bytes header)
     HEADER_SIZE = 13       # Enhanced header: chunk_num(2) + total_chunks(2) + data_size(1) + chunk_crc32(4) + global_crc32(4)
     MTU_SIZE = 185         # Maximum transmission unit
     
@@ -46,6 +70,10 @@ class ChunkedBLEProtocol:
     MAX_TOTAL_DATA_SIZE = 64 * 1024    # 64KB max transfer
     MAX_CHUNKS_PER_TRANSFER = 365      # ~64KB / 172 bytes
     DEFAULT_CHUNK_TIMEOUT = 60.0        # Default 5 seconds per chunk timeout
+    DEFAULT_MAX_IN_FLIGHT = 4           # Outstanding Write Without Response chunks
+    DEFAULT_INTER_CHUNK_DELAY = 0.0     # No fixed pause: writes are paced by the send window
+    DEFAULT_WRITE_WITHOUT_RESPONSE = True  # Use Write Without Response when the characteristic allows it
+    DEFAULT_VERIFY_CHUNK_CRC = True     # Check chunk_crc32 on every received chunk
 
     def __init__(self, client: BleakClient, service_uuid: str = DEFAULT_SERVICE_UUID, char_uuid: str = DEFAULT_CHAR_UUID):
         """
@@ -63,30 +91,38 @@ class ChunkedBLEProtocol:
         # Internal BLE components (hidden from user)
         self._characteristic: Optional[BleakGATTCharacteristic] = None
         self._notifications_enabled = False
+        self._write_without_response = False  # Set from characteristic properties
+        self._prefer_write_without_response = self.DEFAULT_WRITE_WITHOUT_RESPONSE  # Configurable write mode
+        self._send_chunk_size = self.CHUNK_SIZE  # Grown to fit the negotiated MTU in initialize()
         
         # Receive buffer management
-        self._received_chunks: List[Optional[bytes]] = []
+        # Assembly buffers are allocated once for the largest accepted transfer and reused
+        max_recv_chunks = self.MAX_TOTAL_DATA_SIZE // self.CHUNK_SIZE
+        self._recv_buf = bytearray(self.MAX_TOTAL_DATA_SIZE)  # Chunk payloads at chunk_index * _recv_chunk_size
+        self._recv_mask = bytearray(max_recv_chunks)  # 1 per received chunk (duplicate detection)
+        self._recv_len = 0                            # Assembled length, known once the last chunk arrives
+        self._recv_chunk_size = self.CHUNK_SIZE       # Slot size of the current transfer, taken from chunk 1
         self._expected_chunks = 0
         self._received_chunk_count = 0
         self._complete_data_event = asyncio.Event()
         self._received_data: Optional[bytes] = None
         
+        # Notifications are queued by the BLE callback and processed by a consumer task
+        self._chunk_queue: asyncio.Queue = asyncio.Queue()
+        self._consumer_task: Optional[asyncio.Task] = None
+        
         # Transfer state and timing (only chunk timeout needed)
         self._transfer_in_progress = False
         self._transfer_start_time = None
         self._chunk_timeout = self.DEFAULT_CHUNK_TIMEOUT  # Configurable chunk timeout
+        self._max_in_flight = self.DEFAULT_MAX_IN_FLIGHT  # Configurable send window
+        self._inter_chunk_delay = self.DEFAULT_INTER_CHUNK_DELAY  # Optional pause for slow receivers
+        self._verify_chunk_crc = self.DEFAULT_VERIFY_CHUNK_CRC  # Per-chunk CRC check on receive
         self._last_chunk_time = None  # Initialize to None
         self._expected_global_crc32 = None  # Expected global CRC32 from first chunk
         
         # Security and statistics
-        self._stats = {
-            'total_data_sent': 0,
-            'total_data_received': 0,
-            'crc_errors': 0,
-            'timeouts': 0,
-            'successful_transfers': 0,
-            'last_transfer_time': 0.0
-        }
+        self._stats = self._new_statistics()
         
         # Callbacks (C++-like delegates)
         self._data_received_callback: Optional[Callable[[bytes], None]] = None
@@ -97,6 +133,7 @@ class ChunkedBLEProtocol:
         self._log(f"[PROTOCOL] MTU={self.MTU_SIZE}, Chunk size={self.CHUNK_SIZE} bytes, Header={self.HEADER_SIZE} bytes")
         self._log(f"[SECURITY] Max data: {self.MAX_TOTAL_DATA_SIZE} bytes, Max chunks: {self.MAX_CHUNKS_PER_TRANSFER}")
         self._log(f"[CONFIG] Chunk timeout: {self._chunk_timeout}s (configurable)")
+        self._log(f"[CRC] CRC32 backend: {CRC32_BACKEND}")
         self._log(f"[PROTOCOL] Service UUID: {self.service_uuid}")
         self._log(f"[PROTOCOL] Characteristic UUID: {self.char_uuid}")
     
@@ -110,31 +147,34 @@ class ChunkedBLEProtocol:
         try:
             self._log("[BLE] Discovering services...")
             
-            # Find service and characteristic automatically
+            # Find service and characteristic automatically (dict lookups, UUIDs normalized by bleak)
             services = await self.client.get_services()
             
-            target_service = None
-            for service in services:
-                if service.uuid.lower() == self.service_uuid.lower():
-                    target_service = service
-                    break
-            
+            target_service = services.get_service(self.service_uuid)
             if not target_service:
-                self._log(f"[ERROR] Service {self.service_uuid} not found")
+                self._log(f"[ERROR] Service {self.service_uuid} not found", level=logging.ERROR)
                 return False
             
             # Find characteristic
-            for char in target_service.characteristics:
-                if char.uuid.lower() == self.char_uuid.lower():
-                    self._characteristic = char
-                    break
+            self._characteristic = target_service.get_characteristic(self.char_uuid)
             
             if not self._characteristic:
-                self._log(f"[ERROR] Characteristic {self.char_uuid} not found")
+                self._log(f"[ERROR] Characteristic {self.char_uuid} not found", level=logging.ERROR)
                 return False
             
             self._log(f"[BLE] Service and characteristic found successfully")
             
+            # Trigger MTU exchange where the backend needs it and log negotiated MTU
+            await self._acquire_mtu()
+            
+            # Prefer Write Without Response for data chunks if peer supports it
+            self._write_without_response = "write-without-response" in self._characteristic.properties
+            self._log(f"[BLE] Write without response: {'supported' if self._write_without_response else 'not supported'}")
+            
+            # Fill each outgoing packet up to the negotiated MTU
+            self._send_chunk_size = self._negotiated_chunk_size()
+            self._log(f"[CHUNK] Send chunk size: {self._send_chunk_size} bytes")
+            
             # Enable notifications automatically
             await self.enable_notifications()
             
@@ -142,9 +182,37 @@ class ChunkedBLEProtocol:
             return True
             
         except Exception as e:
-            self._log(f"[ERROR] Initialization failed: {e}")
+            self._log(f"[ERROR] Initialization failed: {e}", level=logging.ERROR)
             return False
     
+    async def _acquire_mtu(self) -> None:
+        """
+        Request ATT MTU exchange and log negotiated MTU (internal)
+        
+        BlueZ only reports the real MTU after it has been acquired; other backends
+        (CoreBluetooth, WinRT) negotiate it automatically on connect.
+        """
+        try:
+            acquire_mtu = getattr(getattr(self.client, '_backend', None), '_acquire_mtu', None)
+            if acquire_mtu is not None:
+                await acquire_mtu()
+            self._log(f"[BLE] Negotiated MTU: {self.client.mtu_size}")
+        except Exception as e:
+            self._log(f"[BLE] MTU exchange not available: {e}", level=logging.WARNING)
+    
+    def _negotiated_chunk_size(self) -> int:
+        """
+        Get chunk data size for sending that fits into one ATT PDU (internal)
+        
+        Never smaller than CHUNK_SIZE (the protocol default) and never larger than
+        MAX_CHUNK_SIZE (the limit enforced by the ESP32 receiver).
+        """
+        try:
+            fitting_size = self._max_write_without_response_size() - self.HEADER_SIZE
+        except Exception:
+            return self.CHUNK_SIZE
+        return max(self.CHUNK_SIZE, min(self.MAX_CHUNK_SIZE, fitting_size))
+    
     async def enable_notifications(self) -> bool:
         """
         Enable notifications on characteristic (internal)
@@ -154,13 +222,15 @@ class ChunkedBLEProtocol:
         """
         try:
             if self._characteristic and not self._notifications_enabled:
+                if self._consumer_task is None:
+                    self._consumer_task = asyncio.ensure_future(self._chunk_consumer())
                 await self.client.start_notify(self._characteristic, self._notification_handler)
                 self._notifications_enabled = True
                 self._log("[BLE] Notifications enabled")
                 return True
             return False
         except Exception as e:
-            self._log(f"[ERROR] Failed to enable notifications: {e}")
+            self._log(f"[ERROR] Failed to enable notifications: {e}", level=logging.ERROR)
             return False
     
     async def disable_notifications(self) -> bool:
@@ -178,8 +248,10 @@ class ChunkedBLEProtocol:
                 return True
             return False
         except Exception as e:
-            self._log(f"[ERROR] Failed to disable notifications: {e}")
+            self._log(f"[ERROR] Failed to disable notifications: {e}", level=logging.ERROR)
             return False
+        finally:
+            await self._stop_chunk_consumer()
     
     def set_data_received_callback(self, callback: Callable[[bytes], None]) -> None:
         """
@@ -220,6 +292,56 @@ class ChunkedBLEProtocol:
         self._chunk_timeout = timeout_seconds
         self._log(f"[CONFIG] Chunk timeout set to {self._chunk_timeout}s")
     
+    def set_max_in_flight(self, max_in_flight: int) -> None:
+        """
+        Set maximum number of outstanding chunk writes (C++-like API)
+        
+        Only applies to Write Without Response; acknowledged writes are sent one at a time.
+        
+        Args:
+            max_in_flight: Number of chunks that may be queued in the BLE stack
+        """
+        self._max_in_flight = max(1, max_in_flight)
+        self._log(f"[CONFIG] Max in-flight chunks set to {self._max_in_flight}")
+    
+    def set_write_without_response(self, enabled: bool) -> None:
+        """
+        Enable or disable Write Without Response for data chunks (C++-like API)
+        
+        Only takes effect if the characteristic supports it and a packet fits into one ATT PDU.
+        
+        Args:
+            enabled: False forces acknowledged writes for every chunk
+        """
+        self._prefer_write_without_response = enabled
+        self._log(f"[CONFIG] Write without response {'enabled' if enabled else 'disabled'}")
+    
+    def set_inter_chunk_delay(self, delay_seconds: float) -> None:
+        """
+        Set fixed delay between chunks in seconds (C++-like API)
+        
+        Not needed normally: acknowledged writes and the in-flight window already
+        provide backpressure. Use only for receivers that drop back-to-back chunks.
+        
+        Args:
+            delay_seconds: Delay after each chunk in seconds (0 disables)
+        """
+        self._inter_chunk_delay = max(0.0, delay_seconds)
+        self._log(f"[CONFIG] Inter-chunk delay set to {self._inter_chunk_delay}s")
+    
+    def set_verify_chunk_crc(self, enabled: bool) -> None:
+        """
+        Enable or disable per-chunk CRC32 verification on receive (C++-like API)
+        
+        The global CRC32 of the assembled data is always checked, so disabling this
+        only moves detection of a corrupted chunk to the end of the transfer.
+        
+        Args:
+            enabled: False skips the chunk_crc32 check and relies on the BLE link-layer CRC
+        """
+        self._verify_chunk_crc = enabled
+        self._log(f"[CONFIG] Chunk CRC32 verification {'enabled' if enabled else 'disabled'}")
+    
     async def send_data(self, data: bytes) -> bool:
         """
         Send data using chunked protocol
@@ -231,57 +353,107 @@ class ChunkedBLEProtocol:
             True if sent successfully, False otherwise
         """
         if not self._characteristic:
-            self._log("[ERROR] Protocol not initialized")
+            self._log("[ERROR] Protocol not initialized", level=logging.ERROR)
             return False
         
+        pending_writes = []
         try:
             data_size = len(data)
             
             # Validate data size against security limits
             if not self._validate_data_size(data_size):
-                self._log(f"[ERROR] Data rejected by security validation")
+                self._log(f"[ERROR] Data rejected by security validation", level=logging.ERROR)
                 return False
             
-            total_chunks = (data_size + self.CHUNK_SIZE - 1) // self.CHUNK_SIZE  # Round up
+            chunk_size = self._send_chunk_size
+            total_chunks = (data_size + chunk_size - 1) // chunk_size  # Round up
             if total_chunks > self.MAX_CHUNKS_PER_TRANSFER:
-                self._log(f"[ERROR] Too many chunks ({total_chunks} > {self.MAX_CHUNKS_PER_TRANSFER})")
+                self._log(f"[ERROR] Too many chunks ({total_chunks} > {self.MAX_CHUNKS_PER_TRANSFER})", level=logging.ERROR)
                 return False
             
             self._log(f"[CHUNK] Sending data in {total_chunks} chunks, total size: {data_size} bytes")
             self._log(f"[SECURITY] Data passed validation (max {self.MAX_TOTAL_DATA_SIZE} bytes, {self.MAX_CHUNKS_PER_TRANSFER} chunks)")
             
+            # Use Write Without Response only if the largest packet fits into a single ATT PDU,
+            # otherwise fall back to acknowledged (long) writes
+            max_packet_size = self.HEADER_SIZE + min(chunk_size, data_size)
+            use_response = not (self._prefer_write_without_response and self._write_without_response
+                                and max_packet_size <= self._max_write_without_response_size())
+            self._log(f"[CHUNK] Write mode: {'with response' if use_response else 'without response'}")
+            
             # Start transfer timing
-            send_start_time = time.time()
+            send_start_time = time.perf_counter()
             
-            for chunk_num in range(total_chunks):
-                chunk_start = chunk_num * self.CHUNK_SIZE
-                chunk_end = min(chunk_start + self.CHUNK_SIZE, data_size)
-                chunk_data = data[chunk_start:chunk_end]
-                chunk_data_size = len(chunk_data)
-                
-                # Calculate CRC32 for chunk data
-                crc32 = self._calculate_crc32(chunk_data)
+            # Zero-copy view: chunk slices below do not copy payload bytes
+            data_view = memoryview(data)
+            
+            if total_chunks == 1:
+                # Single-chunk fast path: chunk CRC32 equals global CRC32, no packet buffer or send window
+                crc32 = self._calculate_crc32(data_view)
+                self._log(f"[CRC] Global CRC32 for entire file: 0x{crc32:08X}")
+                chunk_packet = _HDR.pack(1, 1, data_size, crc32, crc32) + data_view
+                await self.client.write_gatt_char(self._characteristic, chunk_packet, response=use_response)
                 
-                # Create enhanced header: chunk_num(2) + total_chunks(2) + data_size(1) + crc32(4) + global_crc32(4)
-                header = struct.pack('<HHB', chunk_num + 1, total_chunks, chunk_data_size) + crc32.to_bytes(4, 'little') + self._calculate_crc32(data).to_bytes(4, 'little')
+                if self._progress_callback:
+                    self._progress_callback(1, 1, False)
+            else:
+                # Build all packets up front so the write loop below only juggles I/O.
+                # Packets live back to back in one buffer; each write gets a zero-copy slice of it.
+                packet_buffer = bytearray(total_chunks * self.HEADER_SIZE + data_size)
+                packet_view = memoryview(packet_buffer)
+                packets = []
                 
-                # Combine header and data
-                chunk_packet = header + chunk_data
+                # Global CRC32 is the same in every header. One call over the whole buffer is
+                # several times cheaper than chaining crc32(chunk, crc) per chunk in Python.
+                global_crc32 = self._calculate_crc32(data_view)
+                self._log(f"[CRC] Global CRC32 for entire file: 0x{global_crc32:08X}")
                 
-                # Send chunk
-                await self.client.write_gatt_char(self._characteristic, chunk_packet)
+                for chunk_num in range(total_chunks):
+                    chunk_start = chunk_num * chunk_size
+                    chunk_end = min(chunk_start + chunk_size, data_size)
+                    chunk_data = data_view[chunk_start:chunk_end]
+                    chunk_data_size = len(chunk_data)
+                    
+                    # Calculate CRC32 for chunk data
+                    crc32 = self._calculate_crc32(chunk_data)
+                    
+                    # Write enhanced header: chunk_num(2) + total_chunks(2) + data_size(1) + crc32(4) + global_crc32(4)
+                    packet_start = chunk_num * (self.HEADER_SIZE + chunk_size)
+                    _HDR.pack_into(packet_buffer, packet_start, chunk_num + 1, total_chunks, chunk_data_size, crc32, global_crc32)
+                    
+                    # Copy chunk data right after its header
+                    data_start = packet_start + self.HEADER_SIZE
+                    packet_view[data_start:data_start + chunk_data_size] = chunk_data
+                    packets.append(packet_view[packet_start:data_start + chunk_data_size])
                 
-                self._log(f"[CHUNK] Sent chunk {chunk_num + 1}/{total_chunks} ({chunk_data_size} bytes data, CRC32: 0x{crc32:08X})")
+                # Bounded window of outstanding writes (acknowledged writes are serialized by the stack)
+                window_size = 1 if use_response else max(1, self._max_in_flight)
+                send_window = asyncio.Semaphore(window_size)
+                write_errors = []  # Filled by _write_chunk; the first failure stops submission
                 
-                # Update progress
-                if self._progress_callback:
-                    self._progress_callback(chunk_num + 1, total_chunks, False)
+                for chunk_num, chunk_packet in enumerate(packets, 1):
+                    # Send chunk: acquire a window slot before scheduling so chunks are submitted in order.
+                    # A failed write frees its slot too, so check for failures once the slot is ours.
+                    await send_window.acquire()
+                    if write_errors:
+                        raise write_errors[0]
+                    pending_writes.append(asyncio.ensure_future(
+                        self._write_chunk(chunk_packet, use_response, send_window, write_errors)))
+                    
+                    # Update progress
+                    if self._progress_callback:
+                        self._progress_callback(chunk_num, total_chunks, False)
+                    
+                    # Optional delay between chunks for receivers that need it
+                    if self._inter_chunk_delay > 0:
+                        await asyncio.sleep(self._inter_chunk_delay)
                 
-                # Small delay between chunks to prevent overwhelming receiver
-                await asyncio.sleep(0.01)
+                # Wait for all outstanding writes to complete
+                await asyncio.gather(*pending_writes)
+                pending_writes = []
             
-            send_time = time.time() - send_start_time
-            self._log(f"[CHUNK] All chunks sent successfully in {send_time:.3f}s")
+            send_time = time.perf_counter() - send_start_time
+            self._log(f"[CHUNK] All {total_chunks} chunks sent successfully ({data_size} bytes) in {send_time:.3f}s")
             
             # Update statistics
             self._stats['total_data_sent'] += data_size
@@ -291,8 +463,35 @@ class ChunkedBLEProtocol:
             return True
             
         except Exception as e:
-            self._log(f"[ERROR] Send failed: {e}")
+            self._log(f"[ERROR] Send failed: {e}", level=logging.ERROR)
             return False
+        
+        finally:
+            # On failure or caller cancellation: cancel writes still in flight, wait for them to
+            # unwind and retrieve exceptions of ones that already failed
+            if pending_writes:
+                for task in pending_writes:
+                    task.cancel()
+                await asyncio.gather(*pending_writes, return_exceptions=True)
+    
+    async def _write_chunk(self, packet: memoryview, response: bool, send_window: asyncio.Semaphore,
+                           write_errors: list) -> None:
+        """
+        Write single chunk packet and release its send window slot (internal)
+        
+        Args:
+            packet: Complete chunk packet (header + data)
+            response: Use acknowledged write
+            send_window: Semaphore slot acquired by send_data
+            write_errors: Shared list the write failure is recorded in (checked by send_data)
+        """
+        try:
+            await self.client.write_gatt_char(self._characteristic, packet, response=response)
+        except Exception as e:
+            write_errors.append(e)
+            raise
+        finally:
+            send_window.release()
     
     async def receive_data(self, timeout: float = 30.0) -> Optional[bytes]:
         """
@@ -316,10 +515,10 @@ class ChunkedBLEProtocol:
             return data
             
         except asyncio.TimeoutError:
-            self._log(f"[ERROR] Receive timeout after {timeout} seconds")
+            self._log(f"[ERROR] Receive timeout after {timeout} seconds", level=logging.ERROR)
             return None
         except Exception as e:
-            self._log(f"[ERROR] Receive failed: {e}")
+            self._log(f"[ERROR] Receive failed: {e}", level=logging.ERROR)
             return None
     
     async def cleanup(self) -> None:
@@ -327,34 +526,50 @@ class ChunkedBLEProtocol:
         Cleanup protocol resources
         """
         await self.disable_notifications()
-        self._received_chunks.clear()
-        self._expected_chunks = 0
-        self._received_chunk_count = 0
+        self._reset_receive_state()
         self._received_data = None
         self._complete_data_event.clear()
         self._log("[PROTOCOL] Cleanup complete")
     
     # Internal methods (hidden from user)
     
-    async def _notification_handler(self, sender: BleakGATTCharacteristic, data: bytearray) -> None:
+    def _notification_handler(self, sender: BleakGATTCharacteristic, data: bytearray) -> None:
         """
         Handle incoming BLE notifications (internal)
         
+        Only queues the raw chunk; CRC validation and assembly run in the consumer
+        task so the BLE callback returns immediately.
+        
         Args:
             sender: Characteristic that sent the notification
             data: Received data
         """
-        try:
-            if len(data) < self.HEADER_SIZE:
-                self._log("[ERROR] Received data too small for chunk header")
-                return
-            
-            self._process_received_chunk(bytes(data))
-            
-        except Exception as e:
-            self._log(f"[ERROR] Notification handler failed: {e}")
+        # bleak hands over a fresh buffer per notification, so it is queued without a copy
+        self._chunk_queue.put_nowait(data)
+    
+    async def _chunk_consumer(self) -> None:
+        """
+        Process queued chunks in arrival order (internal)
+        """
+        while True:
+            data = await self._chunk_queue.get()
+            self._process_received_chunk(data)
+    
+    async def _stop_chunk_consumer(self) -> None:
+        """
+        Cancel chunk consumer task and drop unprocessed chunks (internal)
+        """
+        if self._consumer_task is not None:
+            self._consumer_task.cancel()
+            try:
+                await self._consumer_task
+            except asyncio.CancelledError:
+                pass
+            self._consumer_task = None
+        while not self._chunk_queue.empty():
+            self._chunk_queue.get_nowait()
     
-    def _process_received_chunk(self, data: bytes) -> None:
+    def _process_received_chunk(self, data: bytearray) -> None:
         """
         Process received chunk data (internal)
         
@@ -364,123 +579,150 @@ class ChunkedBLEProtocol:
         try:
             # Check minimum data size for header
             if len(data) < self.HEADER_SIZE:
-                self._log(f"[CHUNK] Received data too small for chunk header ({len(data)} bytes)")
+                self._log(f"[CHUNK] Received data too small for chunk header ({len(data)} bytes)", level=logging.WARNING)
                 return
             
             # Parse enhanced header
-            chunk_num, total_chunks, data_size = struct.unpack('<HHB', data[:5])
-            chunk_crc32 = int.from_bytes(data[5:9], 'little')
-            global_crc32 = int.from_bytes(data[9:13], 'little')
-            chunk_data = data[13:13 + data_size]
-            
-            self._log(f"[CHUNK] Received chunk {chunk_num}/{total_chunks} ({data_size} bytes data, CRC32: 0x{chunk_crc32:08X})")
+            chunk_num, total_chunks, data_size, chunk_crc32, global_crc32 = _HDR.unpack_from(data, 0)
+            chunk_data = memoryview(data)[13:13 + data_size]  # zero-copy; copied once into _recv_buf
             
             # Check if data size matches header
             expected_size = self.HEADER_SIZE + data_size
             if len(data) != expected_size:
-                self._log(f"[CHUNK] Data size mismatch: expected {expected_size}, got {len(data)}")
+                self._log(f"[CHUNK] Data size mismatch: expected {expected_size}, got {len(data)}", level=logging.WARNING)
                 self._stats['crc_errors'] += 1
                 return
             
-            # Validate CRC32
-            calculated_crc = self._calculate_crc32(chunk_data)
-            if chunk_crc32 != calculated_crc:
-                self._log(f"[CRC] CRC32 mismatch: expected 0x{chunk_crc32:08X}, calculated 0x{calculated_crc:08X}")
-                self._stats['crc_errors'] += 1
+            # Validate CRC32 (optional: the global CRC32 still covers every byte)
+            if self._verify_chunk_crc:
+                calculated_crc = self._calculate_crc32(chunk_data)
+                if chunk_crc32 != calculated_crc:
+                    self._log(f"[CRC] CRC32 mismatch: expected 0x{chunk_crc32:08X}, calculated 0x{calculated_crc:08X}", level=logging.WARNING)
+                    self._stats['crc_errors'] += 1
+                    return
+            
+            # Senders may fill a larger MTU, but never beyond MAX_CHUNK_SIZE
+            if data_size > self.MAX_CHUNK_SIZE:
+                self._log(f"[CHUNK] Chunk data size {data_size} exceeds max chunk size {self.MAX_CHUNK_SIZE}", level=logging.WARNING)
                 return
             
-            self._log(f"[CRC] CRC32 validation passed for chunk {chunk_num}")
+            # One clock read per chunk, shared by the timer start, timeout check and update below
+            now = time.monotonic()
             
             # Initialize chunks buffer if this is the first chunk
             if chunk_num == 1:
-                self._received_chunks = [None] * total_chunks
+                self._recv_len = 0
                 self._expected_chunks = total_chunks
                 self._received_chunk_count = 0
                 
                 # Start transfer timer
-                self._start_transfer_timer()
+                self._start_transfer_timer(now)
                 
                 self._log(f"[CHUNK] Starting new transfer: expecting {total_chunks} chunks total")
                 
-                # Validate total expected data size
+                # Every chunk but the last is full, so chunk 1 gives the slot size for this transfer
+                if total_chunks > 1 and data_size < self.CHUNK_SIZE:
+                    self._cancel_transfer(f"First chunk too small ({data_size} < {self.CHUNK_SIZE} bytes)")
+                    return
+                self._recv_chunk_size = data_size
+                
+                # Validate total expected data size (also bounds it to the preallocated buffers)
                 estimated_total_size = total_chunks * self.CHUNK_SIZE
                 if not self._validate_data_size(estimated_total_size):
                     self._cancel_transfer("Total data size exceeds limits")
                     return
                 
+                # Reuse assembly buffer: only this transfer's presence flags need clearing
+                self._recv_mask[:total_chunks] = bytes(total_chunks)
+                
                 # Store global CRC32 from first chunk
                 self._expected_global_crc32 = global_crc32
                 self._log(f"[CRC] Expected global CRC32: 0x{global_crc32:08X}")
             else:
                 # Validate global CRC32 consistency across chunks
                 if global_crc32 != self._expected_global_crc32:
-                    self._log(f"[CRC] Global CRC32 inconsistency: expected 0x{self._expected_global_crc32:08X}, got 0x{global_crc32:08X}")
+                    self._log(f"[CRC] Global CRC32 inconsistency: expected 0x{self._expected_global_crc32:08X}, got 0x{global_crc32:08X}", level=logging.WARNING)
                     self._cancel_transfer("Global CRC32 mismatch between chunks")
                     return
             
             # Check chunk timeout
-            if self._check_chunk_timeout():
+            if self._check_chunk_timeout(now):
                 self._cancel_transfer("Chunk timeout")
                 return
             
             # Update chunk timer
-            self._update_chunk_timer()
+            self._update_chunk_timer(now)
             
             # Validate chunk consistency
             if total_chunks != self._expected_chunks:
-                self._log(f"[CHUNK] Inconsistent total chunks: expected {self._expected_chunks}, got {total_chunks}")
+                self._log(f"[CHUNK] Inconsistent total chunks: expected {self._expected_chunks}, got {total_chunks}", level=logging.WARNING)
                 self._cancel_transfer("Inconsistent chunk count")
                 return
             
-            # Check for duplicate chunks
+            # Validate chunk index
             chunk_index = chunk_num - 1  # Convert to 0-based index
-            if chunk_index >= 0 and chunk_index < len(self._received_chunks) and self._received_chunks[chunk_index] is not None:
+            if chunk_index < 0 or chunk_index >= self._expected_chunks:
+                self._log(f"[CHUNK] Invalid chunk index {chunk_index} for {self._expected_chunks} total chunks", level=logging.WARNING)
+                return
+            
+            # Check for duplicate chunks (index is in range now)
+            if self._recv_mask[chunk_index]:
                 self._log(f"[CHUNK] Duplicate chunk {chunk_num} - ignoring")
                 return
             
-            # Validate chunk index
-            if chunk_index < 0 or chunk_index >= len(self._received_chunks):
-                self._log(f"[CHUNK] Invalid chunk index {chunk_index} for {len(self._received_chunks)} total chunks")
+            # Only the last chunk may differ from the slot size
+            if data_size > self._recv_chunk_size or (chunk_num != total_chunks and data_size != self._recv_chunk_size):
+                self._log(f"[CHUNK] Chunk {chunk_num} size {data_size} does not match chunk size {self._recv_chunk_size}", level=logging.WARNING)
                 return
             
-            # Store chunk data
-            self._received_chunks[chunk_index] = chunk_data
+            # Store chunk data in place (no per-chunk bytes objects, no final join)
+            chunk_offset = chunk_index * self._recv_chunk_size
+            if chunk_offset + data_size > len(self._recv_buf):
+                self._cancel_transfer("Total data size exceeds limits")
+                return
+            self._recv_buf[chunk_offset:chunk_offset + data_size] = chunk_data
+            self._recv_mask[chunk_index] = 1
             self._received_chunk_count += 1
             
-            # Update statistics
-            self._stats['total_data_received'] += data_size
+            # Only the last chunk may be short; it determines the assembled length
+            if chunk_num == total_chunks:
+                self._recv_len = chunk_offset + data_size
             
             # Notify progress
             if self._progress_callback:
                 self._progress_callback(self._received_chunk_count, self._expected_chunks, True)
             
-            self._log(f"[CHUNK] Progress: {self._received_chunk_count}/{self._expected_chunks} chunks received")
-            
             # Check if all chunks received
             if self._received_chunk_count == self._expected_chunks:
-                self._log("[CHUNK] All chunks received, assembling complete data")
-                
-                # Assemble complete data
-                complete_data = b''.join(chunk for chunk in self._received_chunks if chunk is not None)
+                # Chunks already sit in order in the assembly buffer
+                assembled = memoryview(self._recv_buf)[:self._recv_len]
                 
                 # Mark transfer as complete
                 self._transfer_in_progress = False
                 
-                self._log(f"[CHUNK] Complete data assembled ({len(complete_data)} bytes)")
+                # One summary per transfer instead of per-chunk logs
+                self._log(f"[CHUNK] All {self._expected_chunks} chunks received, {self._recv_len} bytes assembled "
+                          f"in {now - self._transfer_start_time:.3f}s")
                 
-                # Update final statistics
+                # Update final statistics (byte count is flushed once per transfer, not per chunk)
+                self._stats['total_data_received'] += self._recv_len
                 self._stats['successful_transfers'] += 1
                 self._stats['last_transfer_time'] = time.time()
                 
-                # Validate global CRC32
-                calculated_global_crc32 = self._calculate_crc32(complete_data)
+                # Validate global CRC32 in one pass over the buffer, before copying anything out
+                calculated_global_crc32 = self._calculate_crc32(assembled)
                 if self._expected_global_crc32 != calculated_global_crc32:
-                    self._log(f"[CRC] Global CRC32 mismatch: expected 0x{self._expected_global_crc32:08X}, calculated 0x{calculated_global_crc32:08X}")
+                    assembled.release()
+                    self._log(f"[CRC] Global CRC32 mismatch: expected 0x{self._expected_global_crc32:08X}, calculated 0x{calculated_global_crc32:08X}", level=logging.WARNING)
                     self._stats['crc_errors'] += 1
                     return
                 
                 self._log(f"[CRC] Global CRC32 validation passed")
                 
+                # Single copy of the validated payload
+                complete_data = bytes(assembled)
+                assembled.release()
+                
                 # Store data BEFORE setting event and calling callback (critical for sync!)
                 self._received_data = complete_data
                 
@@ -492,31 +734,27 @@ class ChunkedBLEProtocol:
                     self._data_received_callback(complete_data)
                 
                 # Clear buffers for next reception
-                self._received_chunks.clear()
-                self._expected_chunks = 0
-                self._received_chunk_count = 0
+                self._reset_receive_state()
                 
         except Exception as e:
-            self._log(f"[ERROR] Failed to process chunk: {e}")
+            self._log(f"[ERROR] Failed to process chunk: {e}", level=logging.ERROR)
             self._stats['crc_errors'] += 1
     
-    def _log(self, message: str) -> None:
+    def _log(self, message: str, level: int = logging.INFO) -> None:
         """
         Internal logging utility
         
         Args:
-            message: Message to log
+            message: Ready-formatted message to log
+            level: Logging level (warnings and errors use WARNING/ERROR)
         """
-        print(message)
+        logger.log(level, message)
 
     # Statistics and diagnostics
-    def get_statistics(self) -> dict:
-        """Get transfer statistics"""
-        return self._stats.copy()
-    
-    def reset_statistics(self) -> None:
-        """Reset all statistics"""
-        self._stats = {
+    @staticmethod
+    def _new_statistics() -> dict:
+        """Create zeroed statistics dictionary"""
+        return {
             'total_data_sent': 0,
             'total_data_received': 0,
             'crc_errors': 0,
@@ -524,6 +762,14 @@ class ChunkedBLEProtocol:
             'successful_transfers': 0,
             'last_transfer_time': 0.0
         }
+    
+    def get_statistics(self) -> dict:
+        """Get transfer statistics"""
+        return self._stats.copy()
+    
+    def reset_statistics(self) -> None:
+        """Reset all statistics"""
+        self._stats = self._new_statistics()
         self._log("[STATS] Statistics reset")
     
     def is_transfer_in_progress(self) -> bool:
@@ -531,50 +777,63 @@ class ChunkedBLEProtocol:
         return self._transfer_in_progress
     
     # Timeout and transfer management
-    def _start_transfer_timer(self) -> None:
-        """Start transfer timing"""
-        self._transfer_start_time = time.time()
+    def _start_transfer_timer(self, now: float) -> None:
+        """Start transfer timing (chunk timeout counts from the first chunk of this transfer)"""
+        self._transfer_start_time = now
+        self._last_chunk_time = now
         self._transfer_in_progress = True
     
-    def _update_chunk_timer(self) -> None:
+    def _update_chunk_timer(self, now: float) -> None:
         """Update last chunk received time"""
-        self._last_chunk_time = time.time()
+        self._last_chunk_time = now
     
-    def _check_chunk_timeout(self) -> bool:
-        """Check if chunk timeout exceeded"""
+    def _check_chunk_timeout(self, now: float) -> bool:
+        """Check if chunk timeout exceeded (now: time.monotonic() of the current chunk)"""
         if self._chunk_timeout <= 0:
             return False  # Timeout disabled
         
-        current_time = time.time()
+        current_time = now
         if self._last_chunk_time is None:
             # First chunk - no timeout yet
             return False
             
         time_since_last = current_time - self._last_chunk_time
         if time_since_last > self._chunk_timeout:
-            self._log(f"[TIMEOUT] Chunk timeout exceeded: {time_since_last:.1f}s > {self._chunk_timeout:.1f}s")
+            self._log(f"[TIMEOUT] Chunk timeout exceeded: {time_since_last:.1f}s > {self._chunk_timeout:.1f}s", level=logging.WARNING)
             return True
         return False
     
     def _cancel_transfer(self, reason: str) -> None:
         """Cancel current transfer with reason"""
-        self._log(f"[TRANSFER] Cancelled: {reason}")
+        self._log(f"[TRANSFER] Cancelled: {reason}", level=logging.WARNING)
         self._transfer_in_progress = False
         self._stats['timeouts'] += 1
         
         # Clear receive buffers
-        self._received_chunks.clear()
+        self._reset_receive_state()
+        self._complete_data_event.clear()
+    
+    def _reset_receive_state(self) -> None:
+        """Clear receive chunk counters (buffers are kept; the mask is cleared on the next chunk 1)"""
+        self._recv_len = 0
         self._expected_chunks = 0
         self._received_chunk_count = 0
-        self._complete_data_event.clear()
+    
+    def _max_write_without_response_size(self) -> int:
+        """Get maximum payload for a single Write Without Response"""
+        max_size = getattr(self._characteristic, 'max_write_without_response_size', None)
+        if max_size is None:
+            max_size = self.client.mtu_size - 3  # ATT header
+        return max_size
     
     def _validate_data_size(self, size: int) -> bool:
         """Validate data size against security limits"""
         if size > self.MAX_TOTAL_DATA_SIZE:
-            self._log(f"[SECURITY] Data size {size} exceeds limit {self.MAX_TOTAL_DATA_SIZE}")
+            self._log(f"[SECURITY] Data size {size} exceeds limit {self.MAX_TOTAL_DATA_SIZE}", level=logging.WARNING)
             return False
         return True
     
-    def _calculate_crc32(self, data: bytes) -> int:
-        """Calculate CRC32 for data"""
-        return zlib.crc32(data) & 0xFFFFFFFF
+    # Calculate CRC32 for data: _calculate_crc32(data, crc=0) -> unsigned 32-bit int.
+    # Accepts any buffer; passing the previous result as crc continues the checksum.
+    # Bound directly to the C backend so each call skips a Python frame.
+    _calculate_crc32 = staticmethod(_crc32)
@@ -5,11 +5,34 @@ Provides easy-to-use high-level API for BLE JSON data exchange
 """
 
 import asyncio
+import functools
 import json
+import logging
+import os
 import sys
+import time
 from bleak import BleakScanner, BleakClient
 from chunked_ble_protocol import ChunkedBLEProtocol, DEFAULT_SERVICE_UUID, DEFAULT_CHAR_UUID
 
+# Optional faster JSON parser/encoder; both work on UTF-8 bytes directly (no separate decode/encode)
+try:
+    import orjson
+    _json_loads = orjson.loads
+    # Options bound once at import; non-str keys are stringified like json.dumps does
+    _json_dumps = functools.partial(orjson.dumps, option=orjson.OPT_NON_STR_KEYS)  # compact bytes
+except ImportError:
+    _json_loads = json.loads
+    
+    def _json_dumps(data) -> bytes:
+        # Compact separators: no padding spaces, so fewer bytes and chunks on the air
+        return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+# Print full JSON payloads (BLE_VERBOSE=1); by default only sizes are printed
+VERBOSE = bool(os.environ.get("BLE_VERBOSE"))
+
+# Devices found by earlier scans, keyed by device name (reconnects skip the scan)
+_device_cache = {}
+
 
 class SimpleBLEClient:
     """
@@ -35,6 +58,9 @@ class SimpleBLEClient:
         self.client = None
         self.protocol = None
         self.target_device = None
+        self._data_callback = None
+        self._progress_callback = None
+        self._max_in_flight = None  # None keeps the protocol default
         
         print(f"[INIT] Simple BLE client for device: {device_name}")
     
@@ -46,6 +72,12 @@ class SimpleBLEClient:
         """Set callback for transfer progress"""
         self._progress_callback = callback
     
+    def set_max_in_flight(self, max_in_flight: int) -> None:
+        """Set number of chunk writes kept in flight (Write Without Response only)"""
+        self._max_in_flight = max_in_flight
+        if self.protocol:
+            self.protocol.set_max_in_flight(max_in_flight)
+    
     async def scan_and_find_device(self) -> bool:
         """
         Scan for target device
@@ -54,18 +86,15 @@ class SimpleBLEClient:
             True if device found, False otherwise
         """
         try:
-            print(f"[SCAN] Scanning for BLE devices...")
+            print(f"[SCAN] Scanning for BLE device '{self.device_name}'...")
             
-            devices = await BleakScanner.discover(timeout=10.0)
+            # Stops scanning as soon as the target advertises (no full 10s discovery window)
+            device = await BleakScanner.find_device_by_name(self.device_name, timeout=10.0)
             
-            for device in devices:
-                device_name = device.name or "Unknown"
-                print(f"[SCAN] Found: {device_name} ({device.address})")
-                
-                if device_name == self.device_name:
-                    self.target_device = device
-                    print(f"[SCAN] Target device found: {device_name} at {device.address}")
-                    return True
+            if device:
+                self.target_device = device
+                print(f"[SCAN] Target device found: {self.device_name} at {device.address}")
+                return True
             
             print(f"[ERROR] Target device '{self.device_name}' not found")
             return False
@@ -82,14 +111,17 @@ class SimpleBLEClient:
             True if connection successful, False otherwise
         """
         try:
-            # Scan for device if not already found
+            # Scan for device if not already found (or cached by an earlier connection)
+            if not self.target_device:
+                self.target_device = _device_cache.get(self.device_name)
             if not self.target_device:
                 if not await self.scan_and_find_device():
                     return False
             
-            # Connect to device
+            # Connect to device; passing the BLEDevice avoids a rescan inside bleak and
+            # services= limits GATT discovery to the protocol service
             print(f"[BLE] Connecting to {self.target_device.address}...")
-            self.client = BleakClient(self.target_device.address)
+            self.client = BleakClient(self.target_device, services=[DEFAULT_SERVICE_UUID])
             await self.client.connect()
             print(f"[BLE] Connected successfully")
             
@@ -97,10 +129,12 @@ class SimpleBLEClient:
             self.protocol = ChunkedBLEProtocol(self.client)
             
             # Set callbacks if provided
-            if hasattr(self, '_data_callback'):
+            if self._data_callback is not None:
                 self.protocol.set_data_received_callback(self._data_callback)
-            if hasattr(self, '_progress_callback'):
+            if self._progress_callback is not None:
                 self.protocol.set_progress_callback(self._progress_callback)
+            if self._max_in_flight is not None:
+                self.protocol.set_max_in_flight(self._max_in_flight)
             
             # Initialize protocol (finds service/characteristic automatically)
             if not await self.protocol.initialize():
@@ -108,11 +142,15 @@ class SimpleBLEClient:
                 await self.disconnect()
                 return False
             
+            _device_cache[self.device_name] = self.target_device
             print("[SUCCESS] BLE connection and protocol initialization complete")
             return True
             
         except Exception as e:
             print(f"[ERROR] Connection failed: {e}")
+            # Stale cache entry (device moved or changed address): rescan next time
+            _device_cache.pop(self.device_name, None)
+            self.target_device = None
             await self.disconnect()
             return False
     
@@ -147,7 +185,7 @@ class SimpleBLEClient:
             return False
         
         try:
-            json_data = json.dumps(data).encode('utf-8')
+            json_data = _json_dumps(data)
             return await self.protocol.send_data(json_data)
         except Exception as e:
             print(f"[ERROR] Failed to send JSON: {e}")
@@ -186,7 +224,7 @@ class SimpleBLEClient:
         try:
             data = await self.protocol.receive_data(timeout)
             if data:
-                return json.loads(data.decode('utf-8'))
+                return _json_loads(data)
             return None
         except Exception as e:
             print(f"[ERROR] Failed to receive JSON: {e}")
@@ -214,32 +252,92 @@ class SimpleBLEClient:
         return self.client and self.client.is_connected
 
 
+# Connected clients kept open by simple_json_exchange(keep_alive=...): device name -> (client, idle timer)
+_shared_clients = {}
+
+
+async def _take_shared_client(device_name: str) -> SimpleBLEClient:
+    """Get kept-alive client for device (connected) or a new one (not connected yet)"""
+    entry = _shared_clients.pop(device_name, None)
+    if entry is None:
+        return SimpleBLEClient(device_name)
+    
+    client, idle_timer = entry
+    idle_timer.cancel()
+    if not client.is_connected:
+        # Link dropped while idle: release the old protocol and start over
+        await client.disconnect()
+        return SimpleBLEClient(device_name)
+    return client
+
+
+async def _release_shared_client(client: SimpleBLEClient, keep_alive: float) -> None:
+    """Keep client connected for reuse; disconnect after keep_alive seconds idle"""
+    if client.device_name in _shared_clients:
+        # Another exchange already keeps a connection to this device open
+        await client.disconnect()
+        return
+    
+    idle_timer = asyncio.get_running_loop().call_later(
+        keep_alive, lambda: asyncio.ensure_future(_close_shared_client(client.device_name)))
+    _shared_clients[client.device_name] = (client, idle_timer)
+
+
+async def _close_shared_client(device_name: str) -> None:
+    """Disconnect kept-alive client for device (if any)"""
+    entry = _shared_clients.pop(device_name, None)
+    if entry is not None:
+        client, idle_timer = entry
+        idle_timer.cancel()
+        await client.disconnect()
+
+
+async def close_shared_clients() -> None:
+    """Disconnect all clients kept alive by simple_json_exchange"""
+    for device_name in list(_shared_clients):
+        await _close_shared_client(device_name)
+
+
 # Convenience function for one-liner JSON exchange
-async def simple_json_exchange(device_name: str, request_data: dict, timeout: float = 30.0) -> dict:
+async def simple_json_exchange(device_name: str, request_data: dict, timeout: float = 30.0,
+                               keep_alive: float = 0.0) -> dict:
     """
     One-liner function for simple JSON request-response exchange
     
     Args:
         device_name: Name of BLE device to connect to
-        request_data: JSON data to send
+        request_data: JSON data to send (dict, or already encoded JSON bytes sent as is)
         timeout: Total timeout for operation
+        keep_alive: Keep the connection open for reuse by the next call, closing it
+                    after this many idle seconds (0 disconnects right away)
         
     Returns:
         Response JSON data or None if failed
     """
-    client = SimpleBLEClient(device_name)
+    if keep_alive > 0:
+        client = await _take_shared_client(device_name)
+    else:
+        client = SimpleBLEClient(device_name)
+    response = None
     
     try:
-        # Connect
-        if not await client.connect():
+        # Connect (a kept-alive client is already connected)
+        if not client.is_connected and not await client.connect():
             return None
         
-        # Send request
-        if not await client.send_json(request_data):
+        # Send request (pre-encoded JSON skips a parse/serialize round trip)
+        if isinstance(request_data, (bytes, bytearray, memoryview)):
+            sent = await client.send_data(request_data)
+        else:
+            sent = await client.send_json(request_data)
+        if not sent:
             return None
         
-        # Wait for response
+        # Wait for response (one clock read before and after, no polling)
+        wait_start = time.perf_counter()
         response = await client.receive_json(timeout)
+        if response is not None:
+            print(f"[EXCHANGE] Response received {time.perf_counter() - wait_start:.3f}s after request was sent")
         
         return response
         
@@ -248,7 +346,12 @@ async def simple_json_exchange(device_name: str, request_data: dict, timeout: fl
         return None
     
     finally:
-        await client.disconnect()
+        # Park only after a clean exchange: after a failure or timeout a late reply could
+        # still complete on this protocol and be returned by the next call as its answer
+        if keep_alive > 0 and response is not None and client.is_connected:
+            await _release_shared_client(client, keep_alive)
+        else:
+            await client.disconnect()
 
 
 # Demo usage
@@ -261,14 +364,19 @@ async def demo():
     
     def on_data_received(data: bytes):
         try:
-            json_data = json.loads(data.decode('utf-8'))
-            print(f"[CALLBACK] Received JSON: {json_data}")
-        except:
+            json_data = _json_loads(data)
+            if VERBOSE:
+                print(f"[CALLBACK] Received JSON: {json_data}")
+            else:
+                print(f"[CALLBACK] Received JSON: {len(data)} bytes")
+        except (json.JSONDecodeError, UnicodeDecodeError):
             print(f"[CALLBACK] Received raw data: {len(data)} bytes")
     
     def on_progress(current: int, total: int, is_receiving: bool):
-        direction = "RX" if is_receiving else "TX"
-        print(f"[PROGRESS] {direction}: {current}/{total}")
+        # Runs once per chunk on the receive path: print only the final count unless verbose
+        if VERBOSE or current == total:
+            direction = "RX" if is_receiving else "TX"
+            print(f"[PROGRESS] {direction}: {current}/{total}")
     
     client = SimpleBLEClient("BLE-Chunked")
     client.set_data_received_callback(on_data_received)
@@ -301,26 +409,43 @@ async def demo():
         print("[DEMO] One-liner exchange failed")
 
 
-async def send_json_file(file_path: str, device_name: str = "BLE-Chunked"):
+def _read_file_bytes(file_path: str) -> bytes:
+    """Read whole file as bytes (runs in executor thread)"""
+    with open(file_path, 'rb') as f:
+        return f.read()
+
+
+async def send_json_file(file_path: str, device_name: str = "BLE-Chunked", validate: bool = False):
     """
     Send JSON file to BLE device
     
+    The file bytes are sent as is, without parsing and re-serializing them.
+    
     Args:
         file_path: Path to JSON file
         device_name: BLE device name
+        validate: Parse the file first and refuse to send invalid JSON
     """
     try:
-        # Read JSON file
-        with open(file_path, 'r', encoding='utf-8') as f:
-            json_data = json.load(f)
+        # Read JSON file off the event loop (file I/O is blocking)
+        loop = asyncio.get_running_loop()
+        raw = await loop.run_in_executor(None, _read_file_bytes, file_path)
+        if validate:
+            await loop.run_in_executor(None, _json_loads, raw)
         
-        print(f"[FILE] Loaded JSON from {file_path}: {json_data}")
+        if VERBOSE:
+            print(f"[FILE] Loaded JSON from {file_path}: {raw.decode('utf-8', errors='replace')}")
+        else:
+            print(f"[FILE] Loaded JSON from {file_path} ({len(raw)} bytes)")
         
         # Send via BLE
-        response = await simple_json_exchange(device_name, json_data, timeout=30.0)
+        response = await simple_json_exchange(device_name, raw, timeout=30.0)
         
         if response:
-            print(f"[SUCCESS] Response received: {response}")
+            if VERBOSE:
+                print(f"[SUCCESS] Response received: {response}")
+            else:
+                print("[SUCCESS] Response received")
             return response
         else:
             print("[ERROR] No response received")
@@ -338,15 +463,21 @@ async def send_json_file(file_path: str, device_name: str = "BLE-Chunked"):
 
 
 if __name__ == "__main__":
-    if len(sys.argv) > 1:
+    # Protocol logs go through logging: one summary line per transfer, chunk errors as warnings
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
+    args = [arg for arg in sys.argv[1:] if arg != "--validate"]
+    validate = len(args) != len(sys.argv) - 1
+    
+    if args:
         # File mode: send JSON file
-        json_file = sys.argv[1]
-        device_name = sys.argv[2] if len(sys.argv) > 2 else "BLE-Chunked"
+        json_file = args[0]
+        device_name = args[1] if len(args) > 1 else "BLE-Chunked"
         
         print(f"=== Sending JSON file: {json_file} to {device_name} ===")
         
         try:
-            asyncio.run(send_json_file(json_file, device_name))
+            asyncio.run(send_json_file(json_file, device_name, validate))
         except KeyboardInterrupt:
             print("\n[INTERRUPTED] Operation cancelled by user")
         except Exception as e:
@@ -45,7 +45,7 @@ public:
     void onConnect(BLEServer* pServer) override {
         protocol->log("[BLE] Client connected");
         protocol->log("[BLE] Connected clients count: %d", pServer->getConnectedCount());
-        protocol->log("[BLE] MTU will be negotiated to 185 or lower");
+        protocol->log("[BLE] MTU will be negotiated to %d or lower", PREFERRED_MTU);
         protocol->handleConnectionChange(true);
     }
     
@@ -140,6 +140,16 @@ ChunkedBLEProtocol::~ChunkedBLEProtocol() {
 
 // Setup complete BLE service and characteristic
 void ChunkedBLEProtocol::setupBLEService(const char* serviceUUID, const char* charUUID) {
+    // Request larger ATT MTU so a full chunk packet fits into a single PDU
+    BLEDevice::setMTU(PREFERRED_MTU);
+    log("[BLE] Local MTU set to %d", PREFERRED_MTU);
+    
+#ifdef CONFIG_BT_BLE_50_FEATURES_SUPPORTED
+    // Prefer LE 2M PHY for new connections (BLE 5.0 controllers such as ESP32-C3)
+    esp_ble_gap_set_preferred_default_phy(ESP_BLE_GAP_PHY_2M_PREF_MASK, ESP_BLE_GAP_PHY_2M_PREF_MASK);
+    log("[BLE] Preferred PHY set to LE 2M");
+#endif
+    
     // Create service
     bleService = bleServer->createService(serviceUUID);
     log("[BLE] Service created: %s", serviceUUID);
@@ -149,6 +159,7 @@ void ChunkedBLEProtocol::setupBLEService(const char* serviceUUID, const char* ch
         charUUID,
         BLECharacteristic::PROPERTY_READ |
         BLECharacteristic::PROPERTY_WRITE |
+        BLECharacteristic::PROPERTY_WRITE_NR |
         BLECharacteristic::PROPERTY_NOTIFY
     );
     log("[BLE] Characteristic created: %s", charUUID);
@@ -399,6 +410,16 @@ void ChunkedBLEProtocol::processReceivedChunk(const std::string& data) {
             receiveBuffer += receivedChunks[i];
         }
         
+        // Chunks may be larger than CHUNK_SIZE, so the first-chunk estimate is not a hard bound.
+        // Only the byte limit is checked here: the chunk count was already bounded by the header
+        // checks, and validateDataSize() would count chunks of CHUNK_SIZE instead of the real ones.
+        if (receiveBuffer.length() > MAX_TOTAL_DATA_SIZE) {
+            log("[SECURITY] Rejected: Assembled data too large (%d bytes, max %d)",
+                receiveBuffer.length(), MAX_TOTAL_DATA_SIZE);
+            cancelTransfer("Assembled data size exceeds limits");
+            return;
+        }
+        
         // Validate global CRC32 after assembling complete data
         uint32_t calculatedGlobalCRC32 = calculateCRC32((const uint8_t*)receiveBuffer.c_str(), receiveBuffer.length());
         if (calculatedGlobalCRC32 != expectedGlobalCRC32) {
@@ -542,8 +563,9 @@ bool ChunkedBLEProtocol::validateChunkHeader(const ChunkHeader& header) {
     }
     
     // Check data size
-    if (header.data_size == 0 || header.data_size > CHUNK_SIZE) {
-        log("[VALIDATE] Invalid data size: %d (max %d)", header.data_size, CHUNK_SIZE);
+    // Senders may fill larger MTUs, so accept up to MAX_CHUNK_SIZE (not just CHUNK_SIZE)
+    if (header.data_size == 0 || header.data_size > MAX_CHUNK_SIZE) {
+        log("[VALIDATE] Invalid data size: %d (max %d)", header.data_size, MAX_CHUNK_SIZE);
         return false;
     }
     
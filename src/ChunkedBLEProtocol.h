@@ -6,6 +6,7 @@
 #include <BLEServer.h>
 #include <BLEUtils.h>
 #include <BLE2902.h>
+#include <esp_gap_ble_api.h>
 #include <vector>
 #include <string>
 #include <functional>
@@ -33,6 +34,8 @@ public:
     static const size_t HEADER_SIZE = 13;  // chunk_num(2) + total_chunks(2) + data_size(1) + chunk_crc32(4) + global_crc32(4)
     static const size_t CHUNK_SIZE = 172;  // MTU(185) - HEADER_SIZE(13)
     static const size_t MTU_SIZE = 185;
+    static const uint16_t PREFERRED_MTU = 247;  // Requested ATT MTU (fits a full chunk in one PDU)
+    static const size_t MAX_CHUNK_SIZE = 231;   // Largest accepted chunk data: PREFERRED_MTU(247) - ATT(3) - HEADER_SIZE(13)
     
     // Security and reliability limits
     static const size_t MAX_TOTAL_DATA_SIZE = 64 * 1024;    // 64KB max transfer